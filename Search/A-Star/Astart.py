@@ -1,5 +1,7 @@
 import pygame
 import math
+import time
+import numpy as np
 from queue import PriorityQueue
 
 # Definição do tamanho da janela (900x900 pixels)
@@ -19,6 +21,12 @@ ORANGE = (255, 165 ,0)    # Ponto de partida
 GREY = (128, 128, 128)    # Grade/linhas divisórias
 TURQUOISE = (64, 224, 208) # Ponto de chegada
 
+# Limite de quadros por segundo ao redesenhar durante a busca
+MAX_FPS = 60
+
+# Células cuja cor mudou desde o último desenho (só elas são redesenhadas)
+DIRTY = set()
+
 # Classe que representa cada célula (nó) no grid
 class Spot:
     def __init__(self, row, col, width, total_rows):
@@ -28,7 +36,7 @@ class Spot:
         # Posição em pixels na tela
         self.x = row * width
         self.y = col * width
-        self.color = WHITE  # Começa como célula vazia
+        self._color = WHITE  # Começa como célula vazia
         self.neighbors = [] # Lista para armazenar vizinhos válidos
         self.width = width  # Largura da célula em pixels
         self.total_rows = total_rows # Número total de linhas no grid
@@ -37,6 +45,17 @@ class Spot:
     def get_pos(self):
         return self.row, self.col
 
+    # A cor é uma propriedade para que toda mudança marque a célula como suja
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        if value != self._color:
+            self._color = value
+            DIRTY.add(self)
+
     # Métodos para verificar o estado atual da célula
     def is_closed(self):
         return self.color == RED
@@ -103,6 +122,37 @@ class Spot:
         return False
 
 
+# Estatísticas de uma busca, devolvidas pelo algoritmo
+# (o objeto se comporta como True/False conforme o destino foi encontrado)
+class SearchStats:
+    def __init__(self):
+        self.found = False         # O destino foi alcançado?
+        self.path_cost = None      # Custo do caminho encontrado
+        self.nodes_expanded = 0    # Nós retirados da fila e expandidos
+        self.nodes_pushed = 0      # Inserções na fila de prioridade
+        self.max_open_size = 0     # Maior tamanho da fila
+        self.elapsed = 0.0         # Tempo total da busca (segundos)
+        self.draw_time = 0.0       # Parte do tempo gasta desenhando
+
+    def __bool__(self):
+        return self.found
+
+    def __repr__(self):
+        return (f"SearchStats(found={self.found}, path_cost={self.path_cost}, "
+                f"nodes_expanded={self.nodes_expanded}, nodes_pushed={self.nodes_pushed}, "
+                f"max_open_size={self.max_open_size}, elapsed={self.elapsed:.6f}, "
+                f"draw_time={self.draw_time:.6f})")
+
+
+# Envolve a função de desenho para contabilizar o tempo gasto desenhando
+def timed_draw(draw, stats):
+    def wrapper():
+        t0 = time.perf_counter()
+        draw()
+        stats.draw_time += time.perf_counter() - t0
+    return wrapper
+
+
 # Função heurística - calcula a distância Manhattan entre dois pontos
 # Esta é a parte "A" do A* - estima o custo restante até o destino
 def h(p1, p2):
@@ -120,12 +170,19 @@ def reconstruct_path(came_from, current, draw):
 
 
 # Implementação do algoritmo A*
-def algorithm(draw, grid, start, end):
+# on_expand(spot, stats) e on_push(spot, f) são ganchos opcionais chamados a
+# cada nó expandido e a cada inserção na fila; sem eles não há custo extra
+def algorithm(draw, grid, start, end, on_expand=None, on_push=None):
+    stats = SearchStats()
+    t0 = time.perf_counter()
+    draw = timed_draw(draw, stats)
+
     count = 0
     # Fila de prioridade para selecionar o próximo nó a explorar
     open_set = PriorityQueue()
     # Adiciona o nó inicial com prioridade 0
     open_set.put((0, count, start))
+    stats.max_open_size = 1
     # Dicionário para rastrear de onde viemos para cada nó
     came_from = {}
     
@@ -148,6 +205,9 @@ def algorithm(draw, grid, start, end):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
+                stats.nodes_pushed = count + 1
+                stats.elapsed = time.perf_counter() - t0
+                return stats
 
         # Obtém o nó com menor f_score da fila de prioridade
         current = open_set.get()[2]
@@ -157,7 +217,15 @@ def algorithm(draw, grid, start, end):
         if current == end:
             reconstruct_path(came_from, end, draw)
             end.make_end()  # Mantenha o destino visível
-            return True
+            stats.found = True
+            stats.path_cost = g_score[end]
+            stats.nodes_pushed = count + 1
+            stats.elapsed = time.perf_counter() - t0
+            return stats
+
+        stats.nodes_expanded += 1
+        if on_expand is not None:
+            on_expand(current, stats)
 
         # Explore os vizinhos do nó atual
         for neighbor in current.neighbors:
@@ -177,6 +245,11 @@ def algorithm(draw, grid, start, end):
                     open_set.put((f_score[neighbor], count, neighbor))
                     open_set_hash.add(neighbor)
                     neighbor.make_open()  # Marque como aberto visualmente
+                    if on_push is not None:
+                        on_push(neighbor, f_score[neighbor])
+
+        if len(open_set_hash) > stats.max_open_size:
+            stats.max_open_size = len(open_set_hash)
 
         # Redesenha o grid para mostrar o progresso
         draw()
@@ -186,7 +259,9 @@ def algorithm(draw, grid, start, end):
             current.make_closed()
 
     # Se chegamos aqui, não foi encontrado caminho
-    return False
+    stats.nodes_pushed = count + 1
+    stats.elapsed = time.perf_counter() - t0
+    return stats
 
 
 # Cria o grid de células
@@ -206,25 +281,94 @@ def make_grid(rows, width):
 def draw_grid(win, rows, width):
     gap = width // rows
     for i in range(rows):
-        # Linhas horizontais
+        # Linha horizontal e linha vertical de índice i
         pygame.draw.line(win, GREY, (0, i * gap), (width, i * gap))
-        for j in range(rows):
-            # Linhas verticais
-            pygame.draw.line(win, GREY, (j * gap, 0), (j * gap, width))
+        pygame.draw.line(win, GREY, (i * gap, 0), (i * gap, width))
+
+
+# Desenho incremental do grid
+# Guarda as cores das células em um array NumPy e as linhas da grade em uma
+# superfície pronta. A cada quadro redesenha só as células sujas (DIRTY); se
+# forem muitas, copia o array inteiro de uma vez com surfarray
+class Renderer:
+    def __init__(self, win, rows, width, max_fps=MAX_FPS):
+        self.win = win
+        self.rows = rows
+        self.width = width
+        self.gap = width // rows
+        self.size = self.gap * rows  # Lado do tabuleiro em pixels
+        self.min_interval = 1 / max_fps if max_fps else 0
+        self.last_update = float("-inf")
+        self.grid = None
+
+        # Cor de cada célula, indexada como a tela: [x, y] = [linha, coluna]
+        self.colors = np.zeros((rows, rows, 3), dtype=np.uint8)
+        self.small = pygame.Surface((rows, rows))
+
+        # As linhas da grade são desenhadas uma única vez, em fundo transparente
+        self.lines = pygame.Surface((width, width), pygame.SRCALPHA)
+        draw_grid(self.lines, rows, width)
+
+    def draw(self, grid):
+        # Grid novo (início ou tecla C): redesenha tudo
+        if grid is not self.grid:
+            self.grid = grid
+            DIRTY.clear()
+            self.draw_all()
+            return
+
+        if not DIRTY:
+            return
+
+        # Respeita o limite de quadros; as células continuam sujas até o próximo
+        now = time.perf_counter()
+        if now - self.last_update < self.min_interval:
+            return
+
+        if len(DIRTY) > self.rows * self.rows // 8:
+            for spot in DIRTY:
+                self.colors[spot.row, spot.col] = spot.color
+            DIRTY.clear()
+            self.blit_colors()
+            pygame.display.update((0, 0, self.size, self.size))
+        else:
+            rects = []
+            for spot in DIRTY:
+                self.colors[spot.row, spot.col] = spot.color
+                rect = pygame.Rect(spot.x, spot.y, spot.width, spot.width)
+                self.win.fill(spot.color, rect)
+                # Repõe as linhas da grade por cima da célula
+                self.win.blit(self.lines, rect.topleft, rect)
+                rects.append(rect)
+            DIRTY.clear()
+            pygame.display.update(rects)
+        self.last_update = now
+
+    def draw_all(self):
+        self.win.fill(WHITE)
+        self.colors[:] = [[spot.color for spot in row] for row in self.grid]
+        self.blit_colors()
+        pygame.display.update()
+        self.last_update = time.perf_counter()
+
+    def blit_colors(self):
+        # Copia o array para uma superfície de 1 pixel por célula e a amplia
+        pygame.surfarray.blit_array(self.small, self.colors)
+        board = pygame.transform.scale(self.small, (self.size, self.size))
+        self.win.blit(board, (0, 0))
+        self.win.blit(self.lines, (0, 0))
+
+
+renderer = None
 
 
 # Função para atualizar a visualização do grid
 def draw(win, grid, rows, width):
-    win.fill(WHITE)  # Limpa a tela
-
-    # Desenha todas as células
-    for row in grid:
-        for spot in row:
-            spot.draw(win)
-
-    # Desenha as linhas da grade
-    draw_grid(win, rows, width)
-    pygame.display.update()  # Atualiza a tela
+    global renderer
+    # Cria o renderizador na primeira chamada ou se a janela/grade mudou
+    if renderer is None or (renderer.win, renderer.rows, renderer.width) != (win, rows, width):
+        renderer = Renderer(win, rows, width)
+    renderer.draw(grid)
 
 
 # Converte posição do mouse em coordenadas do grid
@@ -296,8 +440,9 @@ def main(win, width):
                         for spot in row:
                             spot.update_neighbors(grid)
 
-                    # Executa o algoritmo A*
-                    algorithm(lambda: draw(win, grid, ROWS, width), grid, start, end)
+                    # Executa o algoritmo A* e mostra as estatísticas da busca
+                    stats = algorithm(lambda: draw(win, grid, ROWS, width), grid, start, end)
+                    print(stats)
 
                 # Tecla C limpa o grid
                 if event.key == pygame.K_c:
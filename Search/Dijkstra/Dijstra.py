@@ -1,6 +1,8 @@
 import heapq
 import pygame
 import math
+import time
+import numpy as np
 
 
 WIDTH = 800
@@ -19,13 +21,19 @@ ORANGE = (255, 165 ,0)    # Ponto de partida
 GREY = (128, 128, 128)    # Grade/linhas divisórias
 TURQUOISE = (64, 224, 208) # Ponto de chegada
 
+# Limite de quadros por segundo ao redesenhar durante a busca
+MAX_FPS = 60
+
+# Células cuja cor mudou desde o último desenho (só elas são redesenhadas)
+DIRTY = set()
+
 class Spot:
     def __init__(self, row, col, width, total_rows):
         self.row = row
         self.col = col
         self.x = row * width
         self.y = col * width
-        self.color = WHITE
+        self._color = WHITE
         self.neighbors = []
         self.width = width
         self.total_rows = total_rows
@@ -34,6 +42,17 @@ class Spot:
     def get_pos(self):
         return self.row, self.col
 
+    # A cor é uma propriedade para que toda mudança marque a célula como suja
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        if value != self._color:
+            self._color = value
+            DIRTY.add(self)
+
     # Métodos para verificar o estado atual da célula
     def is_closed(self):
         return self.color == RED
@@ -96,7 +115,38 @@ class Spot:
         if self.col > 0 and not grid[self.row][self.col - 1].is_barrier():
             self.neighbors.append(grid[self.row][self.col - 1])
         
-def dijkstra(draw, grid, start, end):
+# Estatísticas de uma busca, devolvidas pelo algoritmo
+# (o objeto se comporta como True/False conforme o destino foi encontrado)
+class SearchStats:
+    def __init__(self):
+        self.found = False         # O destino foi alcançado?
+        self.path_cost = None      # Custo do caminho encontrado
+        self.nodes_expanded = 0    # Nós retirados da fila e expandidos
+        self.nodes_pushed = 0      # Inserções na fila de prioridade
+        self.max_open_size = 0     # Maior tamanho da fila
+        self.elapsed = 0.0         # Tempo total da busca (segundos)
+        self.draw_time = 0.0       # Parte do tempo gasta desenhando
+
+    def __bool__(self):
+        return self.found
+
+    def __repr__(self):
+        return (f"SearchStats(found={self.found}, path_cost={self.path_cost}, "
+                f"nodes_expanded={self.nodes_expanded}, nodes_pushed={self.nodes_pushed}, "
+                f"max_open_size={self.max_open_size}, elapsed={self.elapsed:.6f}, "
+                f"draw_time={self.draw_time:.6f})")
+
+
+# Envolve a função de desenho para contabilizar o tempo gasto desenhando
+def timed_draw(draw, stats):
+    def wrapper():
+        t0 = time.perf_counter()
+        draw()
+        stats.draw_time += time.perf_counter() - t0
+    return wrapper
+
+
+def dijkstra(draw, grid, start, end, on_expand=None, on_push=None):
     """
     Implementa o algoritmo de Dijkstra para encontrar o caminho mais curto em um grid
     
@@ -105,9 +155,16 @@ def dijkstra(draw, grid, start, end):
     - grid: grade de células
     - start: célula inicial
     - end: célula final
+    - on_expand: opcional, chamada como on_expand(spot, stats) a cada nó expandido
+    - on_push: opcional, chamada como on_push(spot, dist) a cada inserção na fila
     
-    Retorna True se um caminho foi encontrado, False caso contrário
+    Retorna um SearchStats, que vale True se um caminho foi encontrado
+    e False caso contrário
     """
+    stats = SearchStats()
+    t0 = time.perf_counter()
+    draw = timed_draw(draw, stats)
+
     # Inicializa a contagem para desempate na fila de prioridade
     count = 0
     
@@ -115,6 +172,7 @@ def dijkstra(draw, grid, start, end):
     # (distância, contagem, nó)
     open_queue = []
     heapq.heappush(open_queue, (0, count, start))
+    stats.max_open_size = 1
     
     # Dicionário para rastrear o caminho - de onde viemos para cada nó
     came_from = {}
@@ -132,7 +190,9 @@ def dijkstra(draw, grid, start, end):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
-                return False
+                stats.nodes_pushed = count + 1
+                stats.elapsed = time.perf_counter() - t0
+                return stats
         
         # Obtém o nó atual com a menor distância
         current_dist, _, current = heapq.heappop(open_queue)
@@ -154,10 +214,17 @@ def dijkstra(draw, grid, start, end):
             # Garantimos que o início e fim permaneçam marcados
             start.make_start()
             end.make_end()
-            return True
+            stats.found = True
+            stats.path_cost = current_dist
+            stats.nodes_pushed = count + 1
+            stats.elapsed = time.perf_counter() - t0
+            return stats
         
         # Marca o nó como visitado
         visited[current] = True
+        stats.nodes_expanded += 1
+        if on_expand is not None:
+            on_expand(current, stats)
         
         # Se não for o nó inicial, marca como fechado (para visualização)
         if current != start:
@@ -183,12 +250,19 @@ def dijkstra(draw, grid, start, end):
                 count += 1
                 heapq.heappush(open_queue, (new_dist, count, neighbor))
                 neighbor.make_open()  # Para visualização
+                if on_push is not None:
+                    on_push(neighbor, new_dist)
+
+        if len(open_queue) > stats.max_open_size:
+            stats.max_open_size = len(open_queue)
         
         # Atualiza a visualização após processar cada nó
         draw()
     
     # Se chegamos aqui, não encontramos um caminho
-    return False
+    stats.nodes_pushed = count + 1
+    stats.elapsed = time.perf_counter() - t0
+    return stats
 
 def reconstruct_path(parent, current, draw):
     while current in parent:
@@ -213,19 +287,91 @@ def draw_grid(win, rows, width):
     gap = width // rows
     for i in range(rows):
         pygame.draw.line(win, GREY, (0, i * gap), (width, i * gap))
-        for j in range(rows):
-            pygame.draw.line(win, GREY, (j * gap, 0), (j * gap, width))
-            
-# Função para atualizar a visualização do grid
-def draw(win, grid, rows, width):
-    win.fill(WHITE) 
+        pygame.draw.line(win, GREY, (i * gap, 0), (i * gap, width))
+
+# Desenho incremental do grid
+# Guarda as cores das células em um array NumPy e as linhas da grade em uma
+# superfície pronta. A cada quadro redesenha só as células sujas (DIRTY); se
+# forem muitas, copia o array inteiro de uma vez com surfarray
+class Renderer:
+    def __init__(self, win, rows, width, max_fps=MAX_FPS):
+        self.win = win
+        self.rows = rows
+        self.width = width
+        self.gap = width // rows
+        self.size = self.gap * rows  # Lado do tabuleiro em pixels
+        self.min_interval = 1 / max_fps if max_fps else 0
+        self.last_update = float("-inf")
+        self.grid = None
+
+        # Cor de cada célula, indexada como a tela: [x, y] = [linha, coluna]
+        self.colors = np.zeros((rows, rows, 3), dtype=np.uint8)
+        self.small = pygame.Surface((rows, rows))
+
+        # As linhas da grade são desenhadas uma única vez, em fundo transparente
+        self.lines = pygame.Surface((width, width), pygame.SRCALPHA)
+        draw_grid(self.lines, rows, width)
+
+    def draw(self, grid):
+        # Grid novo (início ou tecla C): redesenha tudo
+        if grid is not self.grid:
+            self.grid = grid
+            DIRTY.clear()
+            self.draw_all()
+            return
+
+        if not DIRTY:
+            return
+
+        # Respeita o limite de quadros; as células continuam sujas até o próximo
+        now = time.perf_counter()
+        if now - self.last_update < self.min_interval:
+            return
+
+        if len(DIRTY) > self.rows * self.rows // 8:
+            for spot in DIRTY:
+                self.colors[spot.row, spot.col] = spot.color
+            DIRTY.clear()
+            self.blit_colors()
+            pygame.display.update((0, 0, self.size, self.size))
+        else:
+            rects = []
+            for spot in DIRTY:
+                self.colors[spot.row, spot.col] = spot.color
+                rect = pygame.Rect(spot.x, spot.y, spot.width, spot.width)
+                self.win.fill(spot.color, rect)
+                # Repõe as linhas da grade por cima da célula
+                self.win.blit(self.lines, rect.topleft, rect)
+                rects.append(rect)
+            DIRTY.clear()
+            pygame.display.update(rects)
+        self.last_update = now
+
+    def draw_all(self):
+        self.win.fill(WHITE)
+        self.colors[:] = [[spot.color for spot in row] for row in self.grid]
+        self.blit_colors()
+        pygame.display.update()
+        self.last_update = time.perf_counter()
+
+    def blit_colors(self):
+        # Copia o array para uma superfície de 1 pixel por célula e a amplia
+        pygame.surfarray.blit_array(self.small, self.colors)
+        board = pygame.transform.scale(self.small, (self.size, self.size))
+        self.win.blit(board, (0, 0))
+        self.win.blit(self.lines, (0, 0))
+
+
+renderer = None
 
-    for row in grid:
-        for spot in row:
-            spot.draw(win)
 
-    draw_grid(win, rows, width)
-    pygame.display.update()  
+# Função para atualizar a visualização do grid
+def draw(win, grid, rows, width):
+    global renderer
+    # Cria o renderizador na primeira chamada ou se a janela/grade mudou
+    if renderer is None or (renderer.win, renderer.rows, renderer.width) != (win, rows, width):
+        renderer = Renderer(win, rows, width)
+    renderer.draw(grid)
 
 
 def get_clicked_pos(pos, rows, width):
@@ -291,7 +437,8 @@ def main(win, width):
                             spot.update_neighbors(grid)
 
             
-                    dijkstra(lambda: draw(win, grid, ROWS, width), grid, start, end)
+                    stats = dijkstra(lambda: draw(win, grid, ROWS, width), grid, start, end)
+                    print(stats)
 
                 # Tecla C limpa o grid
                 if event.key == pygame.K_c:
@@ -0,0 +1,450 @@
+import argparse
+import asyncio
+import csv
+import json
+import multiprocessing
+import numbers
+import os
+import queue as queue_module
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from grid_search import ENGINES, QUEUES, load_map
+from wavefront import route_agents
+
+
+# Servidor de consultas de caminho em lote.
+#
+# O mapa é carregado uma única vez e copiado para memória compartilhada; cada
+# processo do pool apenas "anexa" esse bloco como um array somente leitura,
+# então o mapa não é serializado a cada consulta nem duplicado por processo.
+#
+# Uso:
+#   python batch_query.py batch mapa.txt consultas.txt -o caminhos.csv
+#   python batch_query.py serve mapa.npy --port 8765
+#
+# Cada consulta é uma linha "linha_ini col_ini linha_fim col_fim" (espaços ou
+# vírgulas). No modo "serve" cada requisição é uma linha JSON
+# {"start": [r, c], "goal": [r, c]} e a resposta também é uma linha JSON.
+
+
+class SharedMap:
+    """
+    Mapa de ocupação guardado em memória compartilhada
+
+    O processo dono cria o bloco com SharedMap.create(); os processos do pool
+    recebem apenas (name, shape) e reconstroem a visão com SharedMap.attach().
+    """
+
+    def __init__(self, shm, shape, owner):
+        self.shm = shm
+        self.shape = shape
+        self.owner = owner
+        self.grid = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        if not owner:
+            self.grid.flags.writeable = False
+
+    @classmethod
+    def create(cls, grid):
+        grid = np.ascontiguousarray(grid, dtype=np.uint8)
+        shm = shared_memory.SharedMemory(create=True, size=max(grid.nbytes, 1))
+        shared = cls(shm, grid.shape, owner=True)
+        shared.grid[:] = grid
+        shared.grid.flags.writeable = False
+        return shared
+
+    @classmethod
+    def attach(cls, name, shape):
+        return cls(shared_memory.SharedMemory(name=name), shape, owner=False)
+
+    def close(self):
+        # Descarta a visão antes de fechar, senão o buffer continua exportado
+        self.grid = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Estado de cada processo do pool, preenchido por _init_worker
+_worker_map = None
+_worker_engine = None
+_worker_queue = None
+_worker_group_by_goal = False
+
+
+def _init_worker(name, shape, algorithm, queue):
+    global _worker_map, _worker_engine, _worker_queue, _worker_group_by_goal
+    _worker_map = SharedMap.attach(name, shape)
+    _worker_engine = ENGINES[algorithm]
+    _worker_queue = queue
+    # A frente de onda calcula o campo do mapa todo, que serve para todas as
+    # consultas com o mesmo destino
+    _worker_group_by_goal = algorithm == "wavefront"
+
+
+def _make_pool(shared, algorithm, queue, workers):
+    # Processos criados por fork herdariam os sockets abertos no momento (o de
+    # escuta e os dos clientes no modo "serve"), e os clientes nunca veriam o
+    # fim da conexão. forkserver/spawn partem de um processo limpo
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context(method),
+        initializer=_init_worker,
+        initargs=(shared.shm.name, shared.shape, algorithm, queue),
+    )
+
+
+def _is_point(value):
+    # Par (linha, coluna) de inteiros; bool não conta como inteiro
+    return (isinstance(value, (list, tuple)) and len(value) == 2
+            and all(isinstance(v, numbers.Integral) and not isinstance(v, bool)
+                    for v in value))
+
+
+def _result(query_id, start, goal, path, expanded, latency, error):
+    # Linha de resultado de uma consulta, como é escrita no CSV ou no JSON
+    return {
+        "id": query_id,
+        "start": list(start) if start is not None else None,
+        "goal": list(goal) if goal is not None else None,
+        "cost": len(path) - 1 if path else None,
+        "expanded": expanded,
+        "latency_ms": latency * 1000,
+        "path": [list(p) for p in path] if path else None,
+        "error": error,
+    }
+
+
+def _solve(query):
+    # Resolve uma consulta (id, início, fim, erro) no mapa compartilhado;
+    # consultas que já chegam com erro (ex.: linha malformada) só o repassam
+    query_id, start, goal, error = query
+    if error is None and not (_is_point(start) and _is_point(goal)):
+        error = "start e goal devem ser pares (linha, coluna) de inteiros"
+    if error is not None:
+        return _result(query_id, None, None, None, 0, 0.0, error)
+    t0 = time.perf_counter()
+    try:
+        path, stats = _worker_engine(_worker_map.grid, start, goal, queue=_worker_queue)
+        expanded = stats.nodes_expanded
+    except ValueError as e:
+        # Ponto fora do mapa: vira linha de erro sem derrubar o resto do lote
+        path, expanded, error = None, 0, str(e)
+    return _result(query_id, start, goal, path, expanded, time.perf_counter() - t0, error)
+
+
+def _solve_batch(queries):
+    if _worker_group_by_goal:
+        return _solve_by_goal(queries)
+    return [_solve(query) for query in queries]
+
+
+def _solve_by_goal(queries):
+    # Responde as consultas do lote que têm o mesmo destino com um único campo
+    # de distâncias (route_agents). Consultas sozinhas, fora do mapa ou com
+    # início em barreira seguem uma a uma por _solve
+    grid = _worker_map.grid
+    rows, cols = grid.shape
+    results = [None] * len(queries)
+    groups = {}
+    for i, (_, start, goal, error) in enumerate(queries):
+        valid = (error is None and _is_point(start) and _is_point(goal)
+                 and all(0 <= r < rows and 0 <= c < cols for r, c in (start, goal)))
+        if valid and not grid[start[0], start[1]]:
+            groups.setdefault(tuple(goal), []).append(i)
+        else:
+            results[i] = _solve(queries[i])
+
+    for goal, indices in groups.items():
+        if len(indices) == 1:
+            results[indices[0]] = _solve(queries[indices[0]])
+            continue
+        t0 = time.perf_counter()
+        paths, dist, _ = route_agents(grid, [goal], [queries[i][1] for i in indices])
+        # O tempo e as células alcançadas são do campo, dividido pelo grupo
+        latency = (time.perf_counter() - t0) / len(indices)
+        expanded = int((dist >= 0).sum())
+        for i, path in zip(indices, paths):
+            query_id, start, goal, _ = queries[i]
+            results[i] = _result(query_id, start, goal, path, expanded, latency, None)
+    return results
+
+
+def read_queries(stream):
+    """
+    Lê consultas "linha_ini col_ini linha_fim col_fim", uma por linha
+
+    Linhas vazias e iniciadas por '#' são ignoradas. Gera tuplas
+    (id, (linha, coluna), (linha, coluna), erro), com id sequencial a partir
+    de 0. Uma linha malformada não interrompe a leitura: vira uma consulta
+    sem pontos e com a mensagem em erro, que sai como linha de erro no CSV
+    """
+    query_id = 0
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = line.replace(",", " ").split()
+        try:
+            if len(fields) != 4:
+                raise ValueError(f"esperava 4 inteiros, recebi {len(fields)}")
+            r0, c0, r1, c1 = map(int, fields)
+        except ValueError as e:
+            yield query_id, None, None, f"linha {lineno}: {e} ({line!r})"
+        else:
+            yield query_id, (r0, c0), (r1, c1), None
+        query_id += 1
+
+
+def write_results(results, stream):
+    """
+    Escreve os resultados em CSV: id, início, fim, custo, nós expandidos,
+    latência, caminho e erro
+
+    O caminho é gravado como "r c;r c;..." e fica vazio quando não há caminho.
+    Retorna o número de consultas escritas
+    """
+    writer = csv.writer(stream)
+    writer.writerow(["id", "start_row", "start_col", "goal_row", "goal_col",
+                     "cost", "expanded", "latency_ms", "path", "error"])
+    total = 0
+    for result in results:
+        path = ";".join(f"{r} {c}" for r, c in result["path"] or ())
+        writer.writerow([result["id"], *(result["start"] or ("", "")),
+                         *(result["goal"] or ("", "")),
+                         "" if result["cost"] is None else result["cost"],
+                         result["expanded"],
+                         f"{result['latency_ms']:.3f}", path, result["error"] or ""])
+        total += 1
+    return total
+
+
+def _feed(pool, queries, chunksize, pending):
+    # Lê as consultas em blocos e os envia ao pool. pending é uma fila
+    # limitada, então a leitura espera enquanto a janela estiver cheia
+    try:
+        while chunk := list(islice(queries, chunksize)):
+            pending.put(pool.submit(_solve_batch, chunk))
+    except Exception as e:
+        pending.put(e)
+    pending.put(None)
+
+
+def _stream_results(pending, out):
+    # Devolve os resultados na ordem em que as consultas foram lidas
+    while True:
+        item = pending.get()
+        if item is None:
+            return
+        if isinstance(item, Exception):
+            raise item
+        # Antes de esperar o próximo bloco, publica o que já foi escrito
+        if not item.done():
+            out.flush()
+        yield from item.result()
+
+
+def run_batch(grid, queries, out, algorithm="astar", queue="heapq",
+              workers=None, chunksize=64):
+    """
+    Resolve um fluxo de consultas em paralelo e escreve os resultados em lote
+
+    Parâmetros:
+    - grid: mapa de ocupação (array 2D, diferente de zero nas barreiras)
+    - queries: iterável de (id, início, fim, erro), ex.: read_queries(arquivo)
+    - out: arquivo de texto onde o CSV será escrito
+    - algorithm: nome do algoritmo em grid_search.ENGINES
+    - queue: fila de prioridade usada pelo algoritmo
+    - workers: número de processos (padrão: número de núcleos)
+    - chunksize: consultas enviadas por vez a cada processo
+
+    As consultas são lidas aos poucos: no máximo dois blocos por processo
+    ficam pendentes, e cada resultado é escrito assim que o seu bloco e os
+    anteriores terminam. Retorna o número de consultas resolvidas
+    """
+    workers = workers or os.cpu_count() or 1
+    with SharedMap.create(grid) as shared:
+        with _make_pool(shared, algorithm, queue, workers) as pool:
+            # A leitura fica numa thread própria para que uma entrada lenta
+            # (ex.: stdin) não atrase a escrita dos blocos já resolvidos
+            pending = queue_module.Queue(maxsize=2 * workers)
+            feeder = threading.Thread(target=_feed, daemon=True,
+                                      args=(pool, iter(queries), chunksize, pending))
+            feeder.start()
+            total = write_results(_stream_results(pending, out), out)
+            feeder.join()
+            return total
+
+
+class QueryBatcher:
+    """
+    Agrupa consultas assíncronas e as despacha em lote para o pool
+
+    Cada chamada de submit() espera a resposta da sua consulta; o lote é
+    enviado quando atinge batch_size consultas ou quando a primeira consulta
+    pendente já esperou max_delay segundos, o que vier primeiro.
+    """
+
+    def __init__(self, pool, batch_size=64, max_delay=0.005):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._pending = []
+        self._timer = None
+        self._next_id = 0
+        # Referências aos despachos em andamento, para não serem coletados
+        self._tasks = set()
+
+    async def submit(self, start, goal):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((self._next_id, tuple(start), tuple(goal), None), future))
+        self._next_id += 1
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        queries = [query for query, _ in batch]
+        try:
+            results = await loop.run_in_executor(self.pool, _solve_batch, queries)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _parse_point(request, name):
+    point = request.get(name) if isinstance(request, dict) else None
+    if not _is_point(point):
+        raise ValueError(f"{name} deve ser [linha, coluna] com dois inteiros")
+    return point
+
+
+async def _handle_client(batcher, reader, writer):
+    # Uma requisição JSON por linha; respostas na ordem de conclusão
+    tasks = set()
+
+    async def answer(line):
+        request = None
+        try:
+            request = json.loads(line)
+            start, goal = _parse_point(request, "start"), _parse_point(request, "goal")
+        except ValueError as e:
+            result = {"error": f"requisição inválida: {e}"}
+        else:
+            result = await batcher.submit(start, goal)
+        if isinstance(request, dict) and "id" in request:
+            result["id"] = request["id"]
+        writer.write((json.dumps(result) + "\n").encode())
+        await writer.drain()
+
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        writer.close()
+
+
+async def serve(grid, host="127.0.0.1", port=8765, algorithm="astar",
+                queue="heapq", workers=None, batch_size=64, max_delay=0.005):
+    """
+    Servidor local (TCP) que agrupa as consultas recebidas e as resolve no pool
+    """
+    with SharedMap.create(grid) as shared:
+        with _make_pool(shared, algorithm, queue, workers) as pool:
+            batcher = QueryBatcher(pool, batch_size, max_delay)
+            server = await asyncio.start_server(
+                lambda r, w: _handle_client(batcher, r, w), host, port)
+            print(f"Atendendo consultas em {host}:{port}", file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas de caminho em lote")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def common(p):
+        p.add_argument("map", help="mapa ASCII ou .npy")
+        p.add_argument("--algorithm", choices=sorted(ENGINES), default="astar")
+        p.add_argument("--queue", choices=QUEUES, default="heapq")
+        p.add_argument("--workers", type=int, default=None)
+
+    batch = sub.add_parser("batch", help="resolve um arquivo de consultas")
+    common(batch)
+    batch.add_argument("queries", help="arquivo de consultas ('-' para stdin)")
+    batch.add_argument("-o", "--output", default="-", help="CSV de saída ('-' para stdout)")
+    batch.add_argument("--chunksize", type=int, default=64)
+
+    server = sub.add_parser("serve", help="servidor local de consultas")
+    common(server)
+    server.add_argument("--host", default="127.0.0.1")
+    server.add_argument("--port", type=int, default=8765)
+    server.add_argument("--batch-size", type=int, default=64)
+    server.add_argument("--max-delay", type=float, default=0.005,
+                        help="espera máxima (s) para completar um lote")
+
+    args = parser.parse_args(argv)
+    grid = load_map(args.map)
+
+    if args.command == "serve":
+        asyncio.run(serve(grid, args.host, args.port, args.algorithm, args.queue,
+                          args.workers, args.batch_size, args.max_delay))
+        return
+
+    queries_in = sys.stdin if args.queries == "-" else open(args.queries)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        t0 = time.perf_counter()
+        total = run_batch(grid, read_queries(queries_in), out, args.algorithm,
+                          args.queue, args.workers, args.chunksize)
+        elapsed = time.perf_counter() - t0
+        print(f"{total} consultas em {elapsed:.3f}s "
+              f"({total / elapsed if elapsed else 0:.1f} consultas/s)", file=sys.stderr)
+    finally:
+        if queries_in is not sys.stdin:
+            queries_in.close()
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
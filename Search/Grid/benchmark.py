@@ -0,0 +1,172 @@
+import argparse
+import csv
+import statistics
+import sys
+
+import numpy as np
+
+from grid_search import ENGINES, QUEUELESS, QUEUES
+
+
+# Benchmark dos algoritmos de busca em conjuntos de mapas padronizados.
+#
+# Para cada tipo de mapa e tamanho gera um mapa com semente fixa e um mesmo
+# conjunto de consultas (início, fim) entre células livres; roda todas as
+# combinações de algoritmo e fila sobre essas consultas e imprime uma tabela
+# comparável entre execuções.
+#
+# Uso:
+#   python benchmark.py
+#   python benchmark.py --sizes 64 256 --queries 50 --csv resultados.csv
+
+
+def random_map(size, rng, density=0.3):
+    # Obstáculos sorteados independentemente em cada célula
+    return (rng.random((size, size)) < density).astype(np.uint8)
+
+
+def maze_map(size, rng):
+    # Labirinto perfeito gerado por busca em profundidade (recursive backtracker)
+    # sobre as células de índice ímpar; as paredes ficam nas posições pares
+    grid = np.ones((size, size), dtype=np.uint8)
+    cells = (size - 1) // 2
+    if cells < 1:
+        return grid
+    visited = np.zeros((cells, cells), dtype=bool)
+    stack = [(0, 0)]
+    visited[0, 0] = True
+    grid[1, 1] = 0
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= r + dr < cells and 0 <= c + dc < cells
+                   and not visited[r + dr, c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = options[rng.integers(len(options))]
+        visited[nr, nc] = True
+        # Abre a célula vizinha e a parede entre as duas
+        grid[2 * nr + 1, 2 * nc + 1] = 0
+        grid[r + nr + 1, c + nc + 1] = 0
+        stack.append((nr, nc))
+    return grid
+
+
+def rooms_map(size, rng, room=8):
+    # Salas de room x room separadas por paredes, com uma porta em cada parede
+    grid = np.zeros((size, size), dtype=np.uint8)
+    for k in range(room, size, room):
+        grid[k, :] = 1
+        grid[:, k] = 1
+    for k in range(room, size, room):
+        for start in range(0, size, room):
+            # start > 0 também é uma parede, então a porta fica depois dela
+            low, high = (start + 1 if start else 0), min(start + room, size)
+            if low < high:
+                grid[k, rng.integers(low, high)] = 0
+                grid[rng.integers(low, high), k] = 0
+    return grid
+
+
+MAPS = {
+    "random": random_map,
+    "maze": maze_map,
+    "rooms": rooms_map,
+}
+
+
+def make_queries(grid, count, rng):
+    # Sorteia pares (início, fim) entre as células livres do mapa
+    free = np.argwhere(grid == 0)
+    if len(free) < 2:
+        return []
+    picks = rng.integers(len(free), size=(count, 2))
+    return [(tuple(map(int, free[a])), tuple(map(int, free[b]))) for a, b in picks]
+
+
+def run_case(grid, queries, algorithm, queue):
+    """
+    Roda todas as consultas com um algoritmo e uma fila
+
+    Retorna um dicionário com as médias das estatísticas das buscas
+    """
+    engine = ENGINES[algorithm]
+    results = [engine(grid, start, end, queue=queue)[1] for start, end in queries]
+    times = sorted(stats.elapsed * 1000 for stats in results)
+    return {
+        "queries": len(results),
+        "found": sum(stats.found for stats in results),
+        "expanded": statistics.fmean(stats.nodes_expanded for stats in results),
+        "pushed": statistics.fmean(stats.nodes_pushed for stats in results),
+        "max_open": max(stats.max_open_size for stats in results),
+        "mean_ms": statistics.mean(times),
+        "p95_ms": times[min(len(times) - 1, int(0.95 * len(times)))],
+        "total_ms": sum(times),
+    }
+
+
+def run_suite(map_kinds, sizes, algorithms, queues, queries, seed=0):
+    """
+    Gera os mapas e roda todas as combinações
+
+    Cada (tipo, tamanho) usa a mesma semente em todas as execuções, então os
+    números de execuções diferentes são comparáveis. Gera um dicionário por
+    linha da tabela
+    """
+    for kind in map_kinds:
+        for size in sizes:
+            rng = np.random.default_rng([seed, size, sorted(MAPS).index(kind)])
+            grid = MAPS[kind](size, rng)
+            case_queries = make_queries(grid, queries, rng)
+            if not case_queries:
+                continue
+            for algorithm in algorithms:
+                for queue in (["-"] if algorithm in QUEUELESS else queues):
+                    row = {"map": kind, "size": size, "algorithm": algorithm, "queue": queue}
+                    row.update(run_case(grid, case_queries, algorithm, queue))
+                    yield row
+
+
+COLUMNS = ["map", "size", "algorithm", "queue", "queries", "found",
+           "expanded", "pushed", "max_open", "mean_ms", "p95_ms", "total_ms"]
+
+
+def format_table(rows):
+    # Tabela de texto com colunas alinhadas
+    def fmt(value):
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    lines = [[fmt(row[col]) for col in COLUMNS] for row in rows]
+    widths = [max(len(col), *(len(line[i]) for line in lines)) for i, col in enumerate(COLUMNS)]
+    out = ["  ".join(col.rjust(w) for col, w in zip(COLUMNS, widths))]
+    out.append("  ".join("-" * w for w in widths))
+    out.extend("  ".join(cell.rjust(w) for cell, w in zip(line, widths)) for line in lines)
+    return "\n".join(out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de busca em grid")
+    parser.add_argument("--maps", nargs="+", choices=sorted(MAPS), default=sorted(MAPS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[32, 64, 128])
+    parser.add_argument("--algorithms", nargs="+", choices=sorted(ENGINES), default=sorted(ENGINES))
+    parser.add_argument("--queues", nargs="+", choices=QUEUES, default=list(QUEUES))
+    parser.add_argument("--queries", type=int, default=20, help="consultas por mapa")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="também grava os resultados neste CSV")
+    args = parser.parse_args(argv)
+
+    rows = list(run_suite(args.maps, args.sizes, args.algorithms, args.queues,
+                          args.queries, args.seed))
+    print(format_table(rows))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Resultados gravados em {args.csv}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import heapq
+import time
+from queue import PriorityQueue
+
+import numpy as np
+
+from wavefront import descend, distance_field
+
+
+# Versões "sem janela" do A* e do Dijkstra de A-Star/Astart.py e
+# Dijkstra/Dijstra.py. Em vez de uma matriz de objetos Spot, o mapa é um
+# array NumPy 2D em que qualquer valor diferente de zero é uma barreira.
+# O grid é 4-conectado e todo movimento custa 1, como nos visualizadores.
+
+# Caracteres tratados como obstáculo nos mapas ASCII
+BARRIER_CHARS = set("#@TOX")
+
+
+def load_map(path):
+    """
+    Carrega um mapa de ocupação a partir de um arquivo
+
+    Aceita um arquivo .npy (qualquer valor diferente de zero é barreira) ou
+    um mapa ASCII, uma linha por fileira do grid, em que '#', '@', 'T', 'O'
+    e 'X' são barreiras e qualquer outro caractere é célula livre. O
+    cabeçalho do formato MovingAI ("type", "height", "width", "map") é
+    ignorado se estiver presente.
+
+    Retorna um array uint8 contíguo com 1 nas barreiras e 0 no resto
+    """
+    if str(path).endswith(".npy"):
+        grid = np.load(path)
+        if grid.ndim != 2:
+            raise ValueError(f"o mapa {path} deve ser 2D, mas tem {grid.ndim} dimensões")
+        return np.ascontiguousarray(grid != 0, dtype=np.uint8)
+
+    with open(path) as f:
+        lines = [line.rstrip("\r\n") for line in f]
+
+    # Pula o cabeçalho do MovingAI, se existir
+    if lines and lines[0].startswith("type"):
+        lines = lines[lines.index("map") + 1:]
+    lines = [line for line in lines if line]
+    if not lines:
+        raise ValueError(f"o mapa {path} está vazio")
+
+    width = max(len(line) for line in lines)
+    grid = np.zeros((len(lines), width), dtype=np.uint8)
+    for i, line in enumerate(lines):
+        for j, char in enumerate(line):
+            if char in BARRIER_CHARS:
+                grid[i, j] = 1
+    return grid
+
+
+class SearchStats:
+    """
+    Estatísticas de uma busca, devolvidas por todos os algoritmos
+
+    - found: True se o destino foi alcançado
+    - path_cost: custo do caminho encontrado (None se não houver)
+    - nodes_expanded: nós retirados da fila e expandidos
+    - nodes_pushed: inserções na fila de prioridade
+    - max_open_size: maior tamanho que a fila chegou a ter
+    - elapsed: tempo total da busca, em segundos
+    - draw_time: parte de elapsed gasta desenhando (só nos visualizadores)
+    """
+
+    def __init__(self):
+        self.found = False
+        self.path_cost = None
+        self.nodes_expanded = 0
+        self.nodes_pushed = 0
+        self.max_open_size = 0
+        self.elapsed = 0.0
+        self.draw_time = 0.0
+
+    # Permite continuar usando o resultado como True/False
+    def __bool__(self):
+        return self.found
+
+    def __repr__(self):
+        return (f"SearchStats(found={self.found}, path_cost={self.path_cost}, "
+                f"nodes_expanded={self.nodes_expanded}, nodes_pushed={self.nodes_pushed}, "
+                f"max_open_size={self.max_open_size}, elapsed={self.elapsed:.6f}, "
+                f"draw_time={self.draw_time:.6f})")
+
+
+# Função heurística - distância Manhattan entre dois pontos
+def h(p1, p2):
+    x1, y1 = p1
+    x2, y2 = p2
+    return abs(x1 - x2) + abs(y1 - y2)
+
+
+def _flatten(barrier):
+    # Visão plana (linha por linha) do mapa. Indexar um memoryview devolve
+    # int do Python direto, bem mais rápido que indexar o array NumPy, e não
+    # copia nada quando o mapa já é uint8 contíguo (ex.: memória compartilhada)
+    flat = np.ascontiguousarray(barrier, dtype=np.uint8).reshape(-1)
+    return memoryview(flat)
+
+
+def _neighbors(cells, rows, cols, index):
+    # Mesma ordem de Spot.update_neighbors: abaixo, acima, direita, esquerda
+    row, col = divmod(index, cols)
+    if row < rows - 1 and not cells[index + cols]:
+        yield index + cols
+    if row > 0 and not cells[index - cols]:
+        yield index - cols
+    if col < cols - 1 and not cells[index + 1]:
+        yield index + 1
+    if col > 0 and not cells[index - 1]:
+        yield index - 1
+
+
+def _check_endpoints(barrier, start, end):
+    rows, cols = barrier.shape
+    for name, (row, col) in (("start", start), ("end", end)):
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError(f"{name} {(row, col)} está fora do mapa {rows}x{cols}")
+
+
+def _make_queue(kind):
+    # Devolve (push, pop, size) para a fila escolhida
+    if kind == "heapq":
+        heap = []
+        return (lambda item: heapq.heappush(heap, item),
+                lambda: heapq.heappop(heap),
+                heap.__len__)
+    if kind == "PriorityQueue":
+        pq = PriorityQueue()
+        return pq.put, pq.get, pq.qsize
+    raise ValueError(f"fila desconhecida: {kind!r} (use 'heapq' ou 'PriorityQueue')")
+
+
+# Traça o caminho encontrado, do fim ao início, e devolve do início ao fim
+def reconstruct_path(came_from, current, cols):
+    path = [current]
+    while current in came_from:
+        current = came_from[current]
+        path.append(current)
+    path.reverse()
+    return [divmod(index, cols) for index in path]
+
+
+def astar(barrier, start, end, queue="heapq", on_expand=None, on_push=None):
+    """
+    A* sobre um mapa de ocupação, sem visualização
+
+    Parâmetros:
+    - barrier: array 2D, diferente de zero nas barreiras
+    - start: tupla (linha, coluna) inicial
+    - end: tupla (linha, coluna) final
+    - queue: "heapq" ou "PriorityQueue" (a fila usada em Astart.py)
+    - on_expand: opcional, chamada como on_expand((linha, coluna), stats) a
+      cada nó expandido
+    - on_push: opcional, chamada como on_push((linha, coluna), prioridade)
+      a cada inserção na fila
+
+    Retorna (caminho, stats): a lista de (linha, coluna) do início ao fim, ou
+    None se não houver caminho, e um SearchStats
+    """
+    _check_endpoints(barrier, start, end)
+    t0 = time.perf_counter()
+    stats = SearchStats()
+    rows, cols = barrier.shape
+    cells = _flatten(barrier)
+    source = start[0] * cols + start[1]
+    target = end[0] * cols + end[1]
+    push, pop, size = _make_queue(queue)
+
+    count = 0
+    push((h(start, end), count, source))
+    stats.max_open_size = 1
+    came_from = {}
+    g_score = {source: 0}
+    # A heurística de Manhattan é consistente no grid 4-conectado, então um
+    # nó retirado da fila já tem o menor g e não precisa ser reaberto
+    closed = set()
+    path = None
+
+    while size():
+        current = pop()[2]
+        # Entrada antiga de um nó que foi reinserido com g menor
+        if current in closed:
+            continue
+
+        if current == target:
+            path = reconstruct_path(came_from, current, cols)
+            stats.found = True
+            stats.path_cost = g_score[current]
+            break
+
+        closed.add(current)
+        stats.nodes_expanded += 1
+        if on_expand is not None:
+            on_expand(divmod(current, cols), stats)
+
+        for neighbor in _neighbors(cells, rows, cols, current):
+            if neighbor in closed:
+                continue
+            temp_g_score = g_score[current] + 1
+            if temp_g_score < g_score.get(neighbor, float("inf")):
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                # Sempre reinsere com o novo f; a entrada antiga será ignorada
+                count += 1
+                f_score = temp_g_score + h(divmod(neighbor, cols), end)
+                push((f_score, count, neighbor))
+                if on_push is not None:
+                    on_push(divmod(neighbor, cols), f_score)
+
+        if size() > stats.max_open_size:
+            stats.max_open_size = size()
+
+    # O contador de desempate é também o total de inserções
+    stats.nodes_pushed = count + 1
+    stats.elapsed = time.perf_counter() - t0
+    return path, stats
+
+
+def dijkstra(barrier, start, end, queue="heapq", on_expand=None, on_push=None):
+    """
+    Dijkstra sobre um mapa de ocupação, sem visualização
+
+    Parâmetros:
+    - barrier: array 2D, diferente de zero nas barreiras
+    - start: tupla (linha, coluna) inicial
+    - end: tupla (linha, coluna) final
+    - queue: "heapq" (a fila usada em Dijstra.py) ou "PriorityQueue"
+    - on_expand, on_push: ganchos opcionais, como em astar()
+
+    Retorna (caminho, stats), como em astar()
+    """
+    _check_endpoints(barrier, start, end)
+    t0 = time.perf_counter()
+    stats = SearchStats()
+    rows, cols = barrier.shape
+    cells = _flatten(barrier)
+    source = start[0] * cols + start[1]
+    target = end[0] * cols + end[1]
+    push, pop, size = _make_queue(queue)
+
+    count = 0
+    push((0, count, source))
+    stats.max_open_size = 1
+    came_from = {}
+    dist = {source: 0}
+    visited = set()
+    path = None
+
+    while size():
+        current_dist, _, current = pop()
+        if current in visited:
+            continue
+
+        if current == target:
+            path = reconstruct_path(came_from, current, cols)
+            stats.found = True
+            stats.path_cost = current_dist
+            break
+
+        visited.add(current)
+        stats.nodes_expanded += 1
+        if on_expand is not None:
+            on_expand(divmod(current, cols), stats)
+
+        for neighbor in _neighbors(cells, rows, cols, current):
+            if neighbor in visited:
+                continue
+            new_dist = current_dist + 1
+            if new_dist < dist.get(neighbor, float("inf")):
+                came_from[neighbor] = current
+                dist[neighbor] = new_dist
+                count += 1
+                push((new_dist, count, neighbor))
+                if on_push is not None:
+                    on_push(divmod(neighbor, cols), new_dist)
+
+        if size() > stats.max_open_size:
+            stats.max_open_size = size()
+
+    # O contador de desempate é também o total de inserções
+    stats.nodes_pushed = count + 1
+    stats.elapsed = time.perf_counter() - t0
+    return path, stats
+
+
+def wavefront(barrier, start, end, queue=None, on_expand=None, on_push=None):
+    """
+    Busca em largura vetorizada (ver wavefront.py), sem fila de prioridade
+
+    A onda parte de end e para ao alcançar start. Mesmos parâmetros e mesmo
+    retorno de astar(); queue é ignorado. Cada frente de onda conta como
+    inserida e expandida de uma vez, e os ganchos são chamados célula a célula.
+    A frente que alcança start é inserida mas não expandida, como o destino
+    em astar(). Como nos outros algoritmos, a inserção inicial (aqui, end) não
+    é passada a on_push, que é chamada nodes_pushed - 1 vezes; a prioridade
+    que ela recebe é a distância da célula até end (o número da frente), e
+    não o g a partir de start
+    """
+    _check_endpoints(barrier, start, end)
+    t0 = time.perf_counter()
+    stats = SearchStats()
+
+    on_frontier = None
+    if on_expand is not None or on_push is not None:
+        def on_frontier(d, mask):
+            expand = on_expand if not mask[start[0], start[1]] else None
+            push = on_push if d > 0 else None
+            for row, col in np.argwhere(mask).tolist():
+                if push is not None:
+                    push((row, col), d)
+                if expand is not None:
+                    expand((row, col), stats)
+
+    dist = distance_field(barrier, [end], stop=tuple(start), on_frontier=on_frontier)
+    # Tamanho de cada frente; a última é a que alcançou start (ou a onda morreu)
+    layers = np.bincount(dist[dist >= 0])
+    path = None
+    if dist[start[0], start[1]] >= 0:
+        path = descend(dist, start)
+        stats.found = True
+        stats.path_cost = len(path) - 1
+        stats.nodes_expanded = int(layers[:-1].sum())
+    else:
+        stats.nodes_expanded = int(layers.sum())
+    stats.nodes_pushed = int(layers.sum())
+    stats.max_open_size = int(layers.max()) if len(layers) else 0
+    stats.elapsed = time.perf_counter() - t0
+    return path, stats
+
+
+# Algoritmos disponíveis, por nome
+ENGINES = {
+    "astar": astar,
+    "dijkstra": dijkstra,
+    "wavefront": wavefront,
+}
+
+# Algoritmos que não usam fila de prioridade
+QUEUELESS = {"wavefront"}
+
+QUEUES = ("heapq", "PriorityQueue")
@@ -0,0 +1,176 @@
+import numpy as np
+
+
+# Busca em largura vetorizada (frente de onda) para grids 4-conectados de
+# custo unitário, o mesmo cenário de Astart.py e Dijstra.py.
+#
+# Com todo movimento custando 1 não é preciso fila de prioridade: a partir dos
+# objetivos, a frente de onda inteira avança um passo por vez com operações
+# NumPy (os índices da frente são deslocados para os 4 vizinhos, descontando
+# barreiras e células já visitadas). O resultado é um campo de distâncias até
+# o objetivo mais próximo para o mapa todo, e dele um campo de direções que
+# leva qualquer agente ao objetivo, então muitos agentes indo para o mesmo
+# destino custam uma única computação.
+#
+# Cada passo custa O(tamanho da frente) mais um custo fixo de algumas chamadas
+# NumPy. Em mapas abertos a frente é larga e o ganho é grande; em labirintos e
+# corredores a frente tem poucas células e o número de passos é da ordem do
+# comprimento do caminho, então o custo fixo domina e uma única consulta pode
+# ser mais lenta que o dijkstra() célula a célula de grid_search.py.
+
+# Direções dos vizinhos, na mesma ordem de Spot.update_neighbors:
+# abaixo, acima, direita, esquerda
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def distance_field(barrier, goals, stop=None, on_frontier=None):
+    """
+    Distância de cada célula até o objetivo mais próximo
+
+    Parâmetros:
+    - barrier: array 2D, diferente de zero nas barreiras
+    - goals: lista de (linha, coluna) de onde a onda parte
+    - stop: opcional, (linha, coluna) em que a busca pode parar assim que for
+      alcançada; as células mais distantes ficam com -1. A célula stop é
+      alcançável mesmo se for barreira, como o início em astar() e dijkstra()
+    - on_frontier: opcional, chamada como on_frontier(d, mask) para cada
+      frente de onda (mask booleana das células à distância d)
+
+    Retorna um array int32 com a distância em passos, ou -1 para barreiras e
+    células não alcançadas. Fora stop, barreiras nunca são alcançadas, nem
+    como objetivo. Cada passo só toca as células da frente (ver o comentário
+    no topo do arquivo sobre o custo em labirintos)
+    """
+    free = np.asarray(barrier) == 0
+    rows, cols = free.shape
+    size = rows * cols
+    dist = np.full(free.shape, -1, dtype=np.int32)
+    dist_flat = dist.reshape(-1)
+    unvisited = free.reshape(-1).copy()
+
+    stop_index = None
+    if stop is not None:
+        stop_index = stop[0] * cols + stop[1]
+        unvisited[stop_index] = True
+
+    seeds = []
+    for row, col in goals:
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError(f"objetivo {(row, col)} está fora do mapa {rows}x{cols}")
+        index = row * cols + col
+        if unvisited[index]:
+            seeds.append(index)
+    # Índices (planos) das células da frente atual, sem repetição
+    frontier = np.unique(np.array(seeds, dtype=np.intp))
+    unvisited[frontier] = False
+
+    d = 0
+    while frontier.size:
+        dist_flat[frontier] = d
+        if on_frontier is not None:
+            mask = np.zeros(free.shape, dtype=bool)
+            mask.reshape(-1)[frontier] = True
+            on_frontier(d, mask)
+        if stop_index is not None and dist_flat[stop_index] == d:
+            break
+        # Vizinhos da frente: abaixo, acima, direita, esquerda, sem sair do mapa
+        col = frontier % cols
+        neighbors = np.concatenate((
+            frontier[frontier < size - cols] + cols,
+            frontier[frontier >= cols] - cols,
+            frontier[col < cols - 1] + 1,
+            frontier[col > 0] - 1,
+        ))
+        # A próxima frente são os vizinhos livres ainda não visitados
+        frontier = np.unique(neighbors[unvisited[neighbors]])
+        unvisited[frontier] = False
+        d += 1
+
+    return dist
+
+
+def flow_field(dist):
+    """
+    Direção a seguir a partir de cada célula para chegar ao objetivo
+
+    Retorna um array int8 com o índice em DIRECTIONS do vizinho de menor
+    distância, ou -1 nos objetivos, barreiras e células não alcançadas. Em
+    caso de empate vale a ordem de DIRECTIONS
+    """
+    rows, cols = dist.shape
+    # Distância de cada vizinho; fora do mapa ou inalcançável conta como infinito
+    big = np.iinfo(np.int32).max
+    reach = np.where(dist >= 0, dist, big)
+    padded = np.full((rows + 2, cols + 2), big, dtype=np.int32)
+    padded[1:-1, 1:-1] = reach
+    neighbor_dist = np.stack([padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+                              for dr, dc in DIRECTIONS])
+
+    best = neighbor_dist.argmin(axis=0).astype(np.int8)
+    downhill = dist > 0
+    return np.where(downhill, best, np.int8(-1))
+
+
+def follow_flow(flow, dist, start):
+    """
+    Segue o campo de direções a partir de start
+
+    Retorna a lista de (linha, coluna) de start até o objetivo, ou None se o
+    objetivo não é alcançável a partir de start
+    """
+    row, col = start
+    if dist[row, col] < 0:
+        return None
+    path = [(row, col)]
+    while True:
+        k = flow[row, col]
+        if k < 0:
+            return path
+        dr, dc = DIRECTIONS[k]
+        row, col = row + dr, col + dc
+        path.append((row, col))
+
+
+def descend(dist, start):
+    """
+    Caminho de start até o objetivo descendo o campo de distâncias
+
+    A cada passo vai para o primeiro vizinho, na ordem de DIRECTIONS, com
+    distância uma unidade menor: o mesmo caminho de follow_flow, mas sem
+    montar o campo de direções do mapa todo. Serve para uma consulta só.
+
+    Retorna a lista de (linha, coluna) de start até o objetivo, ou None se
+    start não foi alcançado
+    """
+    rows, cols = dist.shape
+    row, col = start
+    d = int(dist[row, col])
+    if d < 0:
+        return None
+    path = [(row, col)]
+    while d > 0:
+        d -= 1
+        for dr, dc in DIRECTIONS:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols and dist[r, c] == d:
+                row, col = r, c
+                break
+        path.append((row, col))
+    return path
+
+
+def route_agents(barrier, goals, starts):
+    """
+    Rota de vários agentes para o objetivo mais próximo com uma só busca
+
+    Parâmetros:
+    - barrier: array 2D, diferente de zero nas barreiras
+    - goals: lista de (linha, coluna) de destino
+    - starts: lista de (linha, coluna) de cada agente
+
+    Retorna uma lista com o caminho de cada agente (None se não houver) e
+    os campos de distâncias e de direções usados
+    """
+    dist = distance_field(barrier, goals)
+    flow = flow_field(dist)
+    return [follow_flow(flow, dist, start) for start in starts], dist, flow